@@ -23,7 +23,6 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import async_get as device_registry
 from homeassistant.helpers.storage import Store
 
-from . import system_health
 from .core import backward
 from .core import devices as core_devices
 from .core.const import (
@@ -35,12 +34,11 @@ from .core.const import (
     DOMAIN,
 )
 from .core.ewelink import SIGNAL_ADD_ENTITIES, SIGNAL_CONNECTED, XRegistry
-from .core.ewelink.camera import XCameras
 from .core.ewelink.cloud import APP, AuthError
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [
+PLATFORMS = (
     "binary_sensor",
     "button",
     "climate",
@@ -51,7 +49,26 @@ PLATFORMS = [
     "sensor",
     "switch",
     "number",
-]
+)
+
+RFBRIDGE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_NAME): cv.string,
+        vol.Optional(CONF_DEVICE_CLASS): cv.string,
+        vol.Optional(CONF_TIMEOUT, default=120): cv.positive_int,
+        vol.Optional(CONF_PAYLOAD_OFF): cv.string,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+DEVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_NAME): cv.string,
+        vol.Optional(CONF_DEVICE_CLASS): vol.Any(str, list),
+        vol.Optional(CONF_DEVICEKEY): cv.string,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -63,27 +80,8 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(CONF_PASSWORD): cv.string,
                 vol.Optional(CONF_DEFAULT_CLASS): cv.string,
                 vol.Optional(CONF_SENSORS): cv.ensure_list,
-                vol.Optional(CONF_RFBRIDGE): {
-                    cv.string: vol.Schema(
-                        {
-                            vol.Optional(CONF_NAME): cv.string,
-                            vol.Optional(CONF_DEVICE_CLASS): cv.string,
-                            vol.Optional(CONF_TIMEOUT, default=120): cv.positive_int,
-                            vol.Optional(CONF_PAYLOAD_OFF): cv.string,
-                        },
-                        extra=vol.ALLOW_EXTRA,
-                    ),
-                },
-                vol.Optional(CONF_DEVICES): {
-                    cv.string: vol.Schema(
-                        {
-                            vol.Optional(CONF_NAME): cv.string,
-                            vol.Optional(CONF_DEVICE_CLASS): vol.Any(str, list),
-                            vol.Optional(CONF_DEVICEKEY): cv.string,
-                        },
-                        extra=vol.ALLOW_EXTRA,
-                    ),
-                },
+                vol.Optional(CONF_RFBRIDGE): {cv.string: RFBRIDGE_SCHEMA},
+                vol.Optional(CONF_DEVICES): {cv.string: DEVICE_SCHEMA},
             },
             extra=vol.ALLOW_EXTRA,
         ),
@@ -93,6 +91,9 @@ CONFIG_SCHEMA = vol.Schema(
 
 UNIQUE_DEVICES = {}
 
+# send_command params that are not passed to the device
+SERVICE_KEYS = ("device", "params_lan", "command_lan")
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     if not backward.hass_version_supported:
@@ -114,52 +115,71 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
             )
 
     # cameras starts only on first command to it
-    cameras = XCameras()
-
-    try:
-        # import ewelink account from YAML (first time)
+    cameras = None
+
+    # import ewelink account from YAML (first time)
+    conf = XRegistry.config
+    if (
+        conf
+        and CONF_USERNAME in conf
+        and CONF_PASSWORD in conf
+        and not hass.config_entries.async_entries(DOMAIN)
+    ):
         data = {
-            CONF_USERNAME: XRegistry.config[CONF_USERNAME],
-            CONF_PASSWORD: XRegistry.config[CONF_PASSWORD],
+            CONF_USERNAME: conf[CONF_USERNAME],
+            CONF_PASSWORD: conf[CONF_PASSWORD],
         }
-        if not hass.config_entries.async_entries(DOMAIN):
-            coro = hass.config_entries.flow.async_init(
-                DOMAIN, context={"source": SOURCE_IMPORT}, data=data
-            )
-            hass.async_create_task(coro)
-    except Exception:
-        pass
+        coro = hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_IMPORT}, data=data
+        )
+        hass.async_create_task(coro)
 
     async def send_command(call: ServiceCall):
         """Service for send raw command to device.
         :param call: `device` - required param, all other params - optional
         """
-        params = dict(call.data)
-        deviceid = str(params.pop("device"))
+        deviceid = str(call.data["device"])
 
         if len(deviceid) == 10:
-            registry: XRegistry = next(
-                r for r in hass.data[DOMAIN].values() if deviceid in r.devices
-            )
+            # cloud and cache devices are bound to one entry in UNIQUE_DEVICES
+            registry: XRegistry = hass.data[DOMAIN].get(UNIQUE_DEVICES.get(deviceid))
+            if not registry or deviceid not in registry.devices:
+                # local only devices (DIY) are set up without UNIQUE_DEVICES
+                registry = next(
+                    (r for r in hass.data[DOMAIN].values() if deviceid in r.devices),
+                    None,
+                )
+                if not registry:
+                    _LOGGER.error(f"Unknown deviceid {deviceid}")
+                    return
+
             device = registry.devices[deviceid]
 
             # for debugging purposes
-            if v := params.get("set_device"):
+            if v := call.data.get("set_device"):
                 device.update(v)
                 return
 
-            params_lan = params.pop("params_lan", None)
-            command_lan = params.pop("command_lan", None)
+            params = {k: v for k, v in call.data.items() if k not in SERVICE_KEYS}
+            params_lan = call.data.get("params_lan")
+            command_lan = call.data.get("command_lan")
 
             await registry.send(device, params, params_lan, command_lan)
 
         elif len(deviceid) == 6:
-            await cameras.send(deviceid, params["cmd"])
+            nonlocal cameras
+            if cameras is None:
+                from .core.ewelink.camera import XCameras
+
+                cameras = XCameras()
+
+            await cameras.send(deviceid, call.data["cmd"])
 
         else:
             _LOGGER.error(f"Wrong deviceid {deviceid}")
 
-    hass.services.async_register(DOMAIN, "send_command", send_command)
+    if not hass.services.has_service(DOMAIN, "send_command"):
+        hass.services.async_register(DOMAIN, "send_command", send_command)
 
     return True
 
@@ -177,10 +197,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     registry = hass.data[DOMAIN].get(entry.entry_id)
     if not registry:
+        # one Hass session (and connector) for cloud and local of all entries
         session = async_get_clientsession(hass)
         hass.data[DOMAIN][entry.entry_id] = registry = XRegistry(session)
+        registry.store = Store(hass, 1, f"{DOMAIN}/{entry.data['username']}.json")
 
     if entry.options.get("debug") and not _LOGGER.handlers:
+        from . import system_health
+
         await system_health.setup_debug(hass, _LOGGER)
 
     username = entry.data.get(CONF_USERNAME)
@@ -189,7 +213,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # retry only when can't login first time
     if entry.state == ConfigEntryState.SETUP_RETRY:
-        assert mode in ("auto", "cloud")
         try:
             await registry.cloud.login(username, password)
         except Exception as e:
@@ -198,7 +221,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if mode == "auto":
             registry.cloud.start()
         elif mode == "cloud":
-            hass.async_create_task(internal_normal_setup(hass, entry))
+            hass.async_create_task(internal_normal_setup(hass, entry, mode))
         return True
 
     if registry.cloud.auth is None and username and password:
@@ -207,15 +230,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         except Exception as e:
             _LOGGER.warning(f"Can't login with mode: {mode}", exc_info=e)
             if mode in ("auto", "local"):
-                hass.async_create_task(internal_cache_setup(hass, entry))
+                hass.async_create_task(internal_cache_setup(hass, entry, mode))
             if mode in ("auto", "cloud"):
                 if isinstance(e, AuthError):
                     raise ConfigEntryAuthFailed(e)
                 raise ConfigEntryNotReady(e)
-            assert mode == "local"
+            # LOCAL mode works from cache without cloud
             return True
 
-    hass.async_create_task(internal_normal_setup(hass, entry))
+    hass.async_create_task(internal_normal_setup(hass, entry, mode))
     return True
 
 
@@ -232,7 +255,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
-async def internal_normal_setup(hass: HomeAssistant, entry: ConfigEntry):
+async def internal_normal_setup(hass: HomeAssistant, entry: ConfigEntry, mode: str):
     devices = None
 
     try:
@@ -242,17 +265,17 @@ async def internal_normal_setup(hass: HomeAssistant, entry: ConfigEntry):
             devices = await registry.cloud.get_devices(homes)
             _LOGGER.debug(f"{len(devices)} devices loaded from Cloud")
 
-            store = Store(hass, 1, f"{DOMAIN}/{entry.data['username']}.json")
-            await store.async_save(devices)
+            # save before setup_devices, because it will modify devices dicts
+            await registry.store.async_save(devices)
 
     except Exception as e:
         _LOGGER.warning("Can't load devices", exc_info=e)
 
-    await internal_cache_setup(hass, entry, devices)
+    await internal_cache_setup(hass, entry, mode, devices)
 
 
 async def internal_cache_setup(
-    hass: HomeAssistant, entry: ConfigEntry, devices: list = None
+    hass: HomeAssistant, entry: ConfigEntry, mode: str, devices: list = None
 ):
     registry: XRegistry = hass.data[DOMAIN][entry.entry_id]
 
@@ -260,16 +283,10 @@ async def internal_cache_setup(
     if registry.online:
         await async_unload_entry(hass, entry)
 
-    await asyncio.gather(
-        *[
-            hass.config_entries.async_forward_entry_setup(entry, domain)
-            for domain in PLATFORMS
-        ]
-    )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     if devices is None:
-        store = Store(hass, 1, f"{DOMAIN}/{entry.data['username']}.json")
-        devices = await store.async_load()
+        devices = await registry.store.async_load()
         if devices:
             # 16 devices loaded from the Cloud Server
             _LOGGER.debug(f"{len(devices)} devices loaded from Cache")
@@ -287,11 +304,12 @@ async def internal_cache_setup(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, registry.stop)
     )
 
-    mode = entry.options.get(CONF_MODE, "auto")
     if mode != "local" and registry.cloud.auth:
         registry.cloud.start()
     if mode != "cloud":
-        registry.local.start(await zeroconf.async_get_instance(hass))
+        # zeroconf instance may take a while, so don't hold cloud start for it
+        coro = internal_local_start(hass, registry)
+        registry.local.task = local_task = hass.async_create_task(coro)
 
     _LOGGER.debug(mode.upper() + " mode start")
 
@@ -301,9 +319,12 @@ async def internal_cache_setup(
         # we get cloud connected signal even with a cloud error, so we won't
         # hold Hass start event forever
         await registry.cloud.dispatcher_wait(SIGNAL_CONNECTED)
-    elif registry.local.online:
-        # we hope that most of local devices will be discovered in 3 seconds
-        await asyncio.sleep(3)
+    elif mode != "cloud":
+        # wait for local browser start, won't raise if start was cancelled
+        await asyncio.wait([local_task])
+        if registry.local.online:
+            # we hope that most of local devices will be discovered in 3 seconds
+            await asyncio.sleep(3)
 
     # 1. We need add_entities after cloud or local init, so they won't be
     #    unavailable at init state
@@ -314,15 +335,37 @@ async def internal_cache_setup(
         registry.dispatcher_send(SIGNAL_ADD_ENTITIES, entities)
 
 
+async def internal_local_start(hass: HomeAssistant, registry: XRegistry):
+    try:
+        zc = await zeroconf.async_get_async_instance(hass)
+    except Exception as e:
+        _LOGGER.warning("Can't start local discovery", exc_info=e)
+        return
+
+    # registry may be stopped while we were waiting for zeroconf
+    if registry.local.task:
+        registry.local.start(zc)
+
+
 def internal_unique_devices(uid: str, devices: list) -> list:
     """For support multiple integrations - bind each device to one integraion.
     To avoid duplicates.
+
+    Returns list, not generator, because `setup_devices` iterates devices
+    second time to search parent device.
     """
-    return [
-        device
-        for device in devices
-        if UNIQUE_DEVICES.setdefault(device["deviceid"], uid) == uid
-    ]
+    # first entry on cold start owns all its devices
+    if not UNIQUE_DEVICES:
+        UNIQUE_DEVICES.update((device["deviceid"], uid) for device in devices)
+        return list(devices)
+
+    setdefault = UNIQUE_DEVICES.setdefault
+    unique = []
+    append = unique.append
+    for device in devices:
+        if setdefault(device["deviceid"], uid) == uid:
+            append(device)
+    return unique
 
 
 async def async_remove_config_entry_device(
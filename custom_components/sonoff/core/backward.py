@@ -1,4 +1,4 @@
-"""Why Hass v2021.12 minimal?
+"""Why Hass v2022.8 minimal?
 
 - v2021.7 - new Entity attributes style
 - v2021.8 - new electric unit_of_measurement
@@ -7,7 +7,9 @@
 - v2021.12 - new ButtonEntity
 - v2021.12 - new FanEntity percentage logic
 - v2021.12 - new SensorDeviceClass, SensorStateClass classes
+- v2022.7 - new NumberEntity native_value, native_min/max_value, native_step
+- v2022.8 - new ConfigEntries.async_forward_entry_setups
 """
 from homeassistant.const import MAJOR_VERSION, MINOR_VERSION
 
-hass_version_supported = (MAJOR_VERSION, MINOR_VERSION) >= (2021, 12)
+hass_version_supported = (MAJOR_VERSION, MINOR_VERSION) >= (2022, 8)
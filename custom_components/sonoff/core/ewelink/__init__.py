@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import time
+from typing import TYPE_CHECKING
 
 from aiohttp import ClientSession
 
@@ -8,6 +9,10 @@ from .base import SIGNAL_CONNECTED, SIGNAL_UPDATE, XDevice, XRegistryBase
 from .cloud import XRegistryCloud
 from .local import XRegistryLocal
 
+if TYPE_CHECKING:
+    # ewelink registries work without Hass, so import only for annotation
+    from homeassistant.helpers.storage import Store
+
 _LOGGER = logging.getLogger(__name__)
 
 SIGNAL_ADD_ENTITIES = "add_entities"
@@ -16,6 +21,7 @@ LOCAL_TTL = 60
 
 class XRegistry(XRegistryBase):
     config: dict = None
+    store: "Store" = None  # devices cache, set by the integration
     task: asyncio.Task = None
 
     def __init__(self, session: ClientSession):
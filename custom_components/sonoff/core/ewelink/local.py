@@ -14,7 +14,7 @@ from Crypto.Cipher import AES
 from Crypto.Hash import MD5
 from Crypto.Random import get_random_bytes
 from zeroconf import Zeroconf, ServiceStateChange
-from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo
+from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
 
 from .base import SIGNAL_CONNECTED, SIGNAL_UPDATE, XDevice, XRegistryBase
 
@@ -74,15 +74,22 @@ def decrypt(payload: dict, devicekey: str):
 class XRegistryLocal(XRegistryBase):
     browser: AsyncServiceBrowser = None
     online: bool = False
+    task: asyncio.Task = None
 
-    def start(self, zeroconf: Zeroconf):
+    def start(self, zeroconf: AsyncZeroconf):
+        # browser and service info work with the sync instance under the hood
         self.browser = AsyncServiceBrowser(
-            zeroconf, "_ewelink._tcp.local.", [self._handler1]
+            zeroconf.zeroconf, "_ewelink._tcp.local.", [self._handler1]
         )
         self.online = True
         self.dispatcher_send(SIGNAL_CONNECTED)
 
     async def stop(self):
+        # cancel start if it still waits for zeroconf
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
         if not self.online:
             return
         self.online = False
@@ -1,5 +1,4 @@
 from homeassistant.components.number import NumberEntity
-from homeassistant.const import MAJOR_VERSION, MINOR_VERSION
 
 from .core.const import DOMAIN
 from .core.entity import XEntity
@@ -7,15 +6,6 @@ from .core.ewelink import SIGNAL_ADD_ENTITIES, XRegistry
 
 PARALLEL_UPDATES = 0  # fix entity_platform parallel_updates Semaphore
 
-# https://github.com/home-assistant/core/blob/2022.7.0/homeassistant/components/number/__init__.py
-BACKWARD = {
-    "_attr_max_value": "_attr_native_max_value",
-    "_attr_min_value": "_attr_native_min_value",
-    "_attr_step": "_attr_native_step",
-    "_attr_value": "_attr_native_value",
-    "async_set_value": "async_set_native_value",
-}
-
 
 async def async_setup_entry(hass, config_entry, add_entities):
     ewelink: XRegistry = hass.data[DOMAIN][config_entry.entry_id]
@@ -48,15 +38,6 @@ class XNumber(XEntity, NumberEntity):
             value /= self.multiply
         await self.ewelink.send(self.device, {self.param: int(value)})
 
-    # backward compatibility fix
-    if (MAJOR_VERSION, MINOR_VERSION) < (2022, 7):
-        # fix Hass v2021.12 empty attribute bug
-        _attr_native_value = None
-
-        def __getattribute__(self, name: str):
-            name = BACKWARD.get(name, name)
-            return super().__getattribute__(name)
-
 
 class XPulseWidth(XNumber):
     _attr_native_max_value = 36000
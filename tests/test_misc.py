@@ -1,7 +1,19 @@
 import asyncio
+from types import SimpleNamespace
 
-from custom_components.sonoff.core.ewelink import XDevice, XRegistry, XRegistryLocal
-from . import save_to
+from custom_components.sonoff import (
+    UNIQUE_DEVICES,
+    async_setup,
+    internal_unique_devices,
+)
+from custom_components.sonoff.core.const import DOMAIN
+from custom_components.sonoff.core.ewelink import (
+    SIGNAL_UPDATE,
+    XDevice,
+    XRegistry,
+    XRegistryLocal,
+)
+from . import DEVICEID, DummyRegistry, save_to
 
 
 def test_bulk():
@@ -47,3 +59,77 @@ def test_issue_1160():
         "9b0810bc-557a-406c-8266-614767890531",
     )
     assert payload == {"switches": [{"outlet": 0, "switch": "off"}]}
+
+
+def test_unique_devices():
+    def reference(unique: dict, uid: str, devices: list) -> list:
+        # previous implementation
+        return [d for d in devices if unique.setdefault(d["deviceid"], uid) == uid]
+
+    devices1 = [{"deviceid": "1000000001"}, {"deviceid": "1000000002"}]
+    devices2 = [{"deviceid": "1000000002"}, {"deviceid": "1000000003"}]
+
+    UNIQUE_DEVICES.clear()
+    unique = {}
+
+    # cold start, first entry owns all its devices
+    devices = internal_unique_devices("entry1", devices1)
+    assert devices == reference(unique, "entry1", devices1) == devices1
+    assert devices is not devices1
+
+    # second entry with overlapping deviceid
+    devices = internal_unique_devices("entry2", devices2)
+    assert devices == reference(unique, "entry2", devices2)
+    assert devices == [{"deviceid": "1000000003"}]
+
+    # reload of the first entry keeps its devices
+    devices = internal_unique_devices("entry1", devices1)
+    assert devices == reference(unique, "entry1", devices1) == devices1
+
+    assert UNIQUE_DEVICES == unique == {
+        "1000000001": "entry1",
+        "1000000002": "entry1",
+        "1000000003": "entry2",
+    }
+
+    UNIQUE_DEVICES.clear()
+
+
+def test_send_command_diy():
+    services = {}
+    # noinspection PyTypeChecker
+    hass = SimpleNamespace(
+        data={},
+        services=SimpleNamespace(
+            has_service=lambda domain, service: service in services,
+            async_register=lambda domain, service, func: services.update(
+                {service: func}
+            ),
+        ),
+    )
+
+    async def run():
+        await async_setup(hass, {})
+
+        reg = DummyRegistry()
+        hass.data[DOMAIN]["entry1"] = reg
+
+        # DIY device is set up from local update, without UNIQUE_DEVICES
+        reg.local.dispatcher_send(
+            SIGNAL_UPDATE,
+            {
+                "deviceid": DEVICEID,
+                "host": "192.168.1.123",
+                "localtype": "diy_plug",
+                "params": {"switch": "on"},
+            },
+        )
+        assert DEVICEID not in UNIQUE_DEVICES
+
+        call = SimpleNamespace(data={"device": DEVICEID, "switch": "off"})
+        await services["send_command"](call)
+
+        return reg
+
+    reg = asyncio.get_event_loop().run_until_complete(run())
+    assert reg.send_args == (reg.devices[DEVICEID], {"switch": "off"}, None, None)